@@ -0,0 +1,92 @@
+# _numba_kernels.py
+# Compiled numerical kernels used by finaml_operations
+
+from functools import lru_cache, wraps
+from importlib.util import find_spec
+
+# Numba is optional: without it the kernels run as plain Python functions.
+# It is only imported, and each kernel only compiled, on the kernel's first call,
+# so importing this module costs nothing when the kernels are not used
+NUMBA_AVAILABLE = find_spec('numba') is not None
+
+# Replaced by numba.prange before the first kernel is compiled
+prange = range
+
+# Compile func with Numba, or return it unchanged when Numba is not installed
+def _compile(func, signature, options):
+    if not NUMBA_AVAILABLE:
+        return func
+    global prange
+    import numba
+    prange = numba.prange
+    return numba.njit(signature, **options)(func)
+
+# Decorator for a kernel compiled with the given signature on its first call
+def _kernel(signature, **options):
+    def decorate(func):
+        compiled = None
+
+        @wraps(func)
+        def kernel(*args):
+            nonlocal compiled
+            if compiled is None:
+                compiled = _compile(func, signature, options)
+            return compiled(*args)
+
+        kernel.py_func = func
+        return kernel
+
+    return decorate
+
+# Kernel to calculate the NPV of a float64 cash flow with Horner's scheme
+# fastmath lets LLVM contract each acc * x + cf[k] step into one fused multiply-add
+@_kernel('float64(float64[::1], float64)', cache=True, fastmath=True)
+def _npv_scalar(cf, r):
+    x = 1.0 / (1.0 + r)
+    acc = 0.0
+    for k in range(cf.size - 1, -1, -1):
+        acc = acc * x + cf[k]
+    return acc
+
+# Kernel to calculate the NPV of a cash flow at every rate on one thread, for grids
+# too small to repay the cost of starting the parallel kernel's threads
+# rates and out may be strided, e.g. the fields of a record array
+@_kernel('void(float64[::1], float64[:], float64[:])', cache=True, fastmath=True)
+def _npv_rates(cf, rates, out):
+    for j in range(rates.size):
+        x = 1.0 / (1.0 + rates[j])
+        acc = 0.0
+        for k in range(cf.size - 1, -1, -1):
+            acc = acc * x + cf[k]
+        out[j] = acc
+
+# Kernel to calculate the NPV of a cash flow at every rate, one rate per thread
+# rates and out may be strided, e.g. the fields of a record array
+@_kernel('void(float64[::1], float64[:], float64[:])', parallel=True, cache=True, fastmath=True)
+def _npv_matrix(cf, rates, out):
+    for j in prange(rates.size):
+        x = 1.0 / (1.0 + rates[j])
+        acc = 0.0
+        for k in range(cf.size - 1, -1, -1):
+            acc = acc * x + cf[k]
+        out[j] = acc
+
+# Kernel to calculate the future value of an array of bonds in one pass
+# An integer period lets LLVM lower the power to repeated multiplication
+@_kernel(['void(float64[::1], float64[::1], int64, float64[::1])',
+          'void(float64[::1], float64[::1], float64, float64[::1])'],
+         parallel=True, cache=True, fastmath=True)
+def _fv_bonds(face, coupon, n, out):
+    for i in prange(face.size):
+        out[i] = face[i] * (1.0 + coupon[i]) ** n
+
+# Build an NPV kernel with the Horner loop fully unrolled for cash flows of n periods
+# Generated source has no file to cache against, so each length is compiled once per process
+@lru_cache(maxsize=64)
+def _make_npv(n):
+    lines = ["def _npv_unrolled(cf, r):", "    x = 1.0 / (1.0 + r)", "    acc = 0.0"]
+    lines += [f"    acc = acc * x + cf[{k}]" for k in range(n - 1, -1, -1)]
+    lines.append("    return acc")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return _compile(namespace['_npv_unrolled'], 'float64(float64[::1], float64)', {'fastmath': True})
@@ -0,0 +1,17 @@
+# build_kernels.py
+# Ahead-of-time compile the single-threaded Numba kernels into the finaml_kernels extension module
+# Run `python build_kernels.py` once; finaml_operations falls back to the JIT kernels without it
+import os
+
+from numba.pycc import CC
+
+from _numba_kernels import _npv_scalar, _npv_rates
+
+cc = CC('finaml_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('npv_scalar', 'f8(f8[::1], f8)')(_npv_scalar.py_func)
+cc.export('npv_rates', 'void(f8[::1], f8[:], f8[:])')(_npv_rates.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -1,4 +1,6 @@
 # finaml_example.py
+import sys
+
 from finaml_types import Stock, Bond, Option
 from finaml_operations import present_value, future_value, simulate_portfolio, calculate_npv, sensitivity_analysis
 
@@ -32,8 +34,9 @@ def main():
     print(f"Total Value of Portfolio: ${total_value:.2f}")
     print(f"Net Present Value (NPV) at 10% discount rate: ${npv_result:.2f}")
     print(f"Sensitivity Analysis on NPV:")
-    for rate, npv in sensitivity_result.items():
-        print(f" - Discount Rate {rate * 100}%: ${npv:.2f}")
+    # Format every row up front and write the block at once, as the rate grid can be long
+    rates, npvs = sensitivity_result.rate.tolist(), sensitivity_result.npv.tolist()
+    sys.stdout.write("".join([" - Discount Rate %s%%: $%.2f\n" % (rate * 100, npv) for rate, npv in zip(rates, npvs)]))
 
 # Run the financial modeling example
 if __name__ == "__main__":
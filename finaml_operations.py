@@ -1,32 +1,257 @@
 # finaml_operations.py
-from finaml_types import Stock, Bond, Option
+from collections import defaultdict
+from collections.abc import Sequence
+
+import numpy as np
+
+from finaml_types import Stock, Bond, Option, Portfolio
+from _numba_kernels import NUMBA_AVAILABLE, _npv_matrix, _fv_bonds, _make_npv
+
+# Prefer the ahead-of-time compiled kernels built by build_kernels.py
+try:
+    from finaml_kernels import npv_scalar as _npv_scalar, npv_rates as _npv_rates
+    _NPV_COMPILED = True
+except ImportError:
+    from _numba_kernels import _npv_scalar, _npv_rates
+    _NPV_COMPILED = NUMBA_AVAILABLE
+
+# Grids with fewer rate-period pairs than this are cheaper on one thread than
+# the cost of waking the parallel kernel's worker threads
+_PARALLEL_MIN_WORK = 1 << 16
+
+__all__ = [
+    'present_value', 'future_value', 'future_value_grid', 'future_value_bonds',
+    'simulate_portfolio', 'calculate_npv', 'specialized_npv', 'NPVContext', 'sensitivity_analysis',
+]
+
+# Number types the float64 paths accept; Fraction, Decimal and other exact types stay in Python
+_FLOAT_TYPES = (int, float, np.integer, np.floating)
+
+# Annual growth rate assumed for stocks
+_STOCK_GROWTH_RATE = 0.05
+
+# Present value of each kind of financial instrument
+def _pv_stock(stock):
+    return stock.current_price
+
+def _pv_bond(bond):
+    return bond.face_value / (1 + bond.coupon_rate)
+
+def _pv_option(option):
+    return 0  # Placeholder, as options require more complex pricing models
+
+# Future value of each kind of financial instrument
+def _fv_stock(stock, time_period):
+    return stock.current_price * (1 + _STOCK_GROWTH_RATE) ** time_period
+
+def _fv_bond(bond, time_period):
+    return bond.face_value * (1 + bond.coupon_rate) ** time_period
+
+def _fv_option(option, time_period):
+    return 0  # Placeholder, as options require more complex pricing models
+
+# Present value of a group of instruments of the same kind
+# Fields that are not all floats (ints, Decimal) keep the exact per-instrument sum
+def _bulk_pv_stock(stocks):
+    prices = np.array([stock.current_price for stock in stocks])
+    if prices.dtype != np.float64:
+        return sum(map(_pv_stock, stocks))
+    return float(prices.sum())
+
+def _bulk_pv_bond(bonds):
+    face = np.array([bond.face_value for bond in bonds])
+    coupon = np.array([bond.coupon_rate for bond in bonds])
+    if face.dtype != np.float64 or coupon.dtype != np.float64:
+        return sum(map(_pv_bond, bonds))
+    return float((face / (1.0 + coupon)).sum())
+
+def _bulk_pv_option(options):
+    return 0  # Placeholder, as options require more complex pricing models
+
+# Growth factors (1 + rate) ** years for an array of periods, matching future_value.
+# A positive float base takes one log and a vectorized exp; other real bases use
+# np.power, and anything else (e.g. Decimal) is raised element by element
+def _growth_grid(rate, years):
+    base = 1 + rate
+    if not isinstance(base, _FLOAT_TYPES):
+        return np.frompyfunc(lambda year: base ** year, 1, 1)(years)
+    years = np.asarray(years, dtype=np.float64)
+    if base > 0:
+        return np.exp(np.log1p(float(rate)) * years)
+    return np.power(float(base), years)
+
+# Future value of each kind of financial instrument over an array of periods
+def _fv_grid_stock(stock, years):
+    return stock.current_price * _growth_grid(_STOCK_GROWTH_RATE, years)
+
+def _fv_grid_bond(bond, years):
+    return bond.face_value * _growth_grid(bond.coupon_rate, years)
+
+def _fv_grid_option(option, years):
+    return np.zeros(np.shape(years))  # Placeholder, as options require more complex pricing models
+
+# Dispatch tables keyed by the exact instrument type
+_PV_DISPATCH = {Stock: _pv_stock, Bond: _pv_bond, Option: _pv_option}
+_FV_DISPATCH = {Stock: _fv_stock, Bond: _fv_bond, Option: _fv_option}
+_FV_GRID_DISPATCH = {Stock: _fv_grid_stock, Bond: _fv_grid_bond, Option: _fv_grid_option}
+_BULK_PV_DISPATCH = {Stock: _bulk_pv_stock, Bond: _bulk_pv_bond, Option: _bulk_pv_option}
+
+# Look up the pricing function for an instrument in a dispatch table
+def _dispatch(table, financial_instrument):
+    try:
+        return table[type(financial_instrument)]
+    except KeyError:
+        raise TypeError(f"Unsupported financial instrument: {type(financial_instrument).__name__}") from None
 
 # Function to calculate the present value of a financial instrument
 def present_value(financial_instrument):
-    if isinstance(financial_instrument, Stock):
-        return financial_instrument.current_price
-    elif isinstance(financial_instrument, Bond):
-        return financial_instrument.face_value / (1 + financial_instrument.coupon_rate)
-    elif isinstance(financial_instrument, Option):
-        return 0  # Placeholder, as options require more complex pricing models
+    return _dispatch(_PV_DISPATCH, financial_instrument)(financial_instrument)
 
 # Function to calculate the future value of a financial instrument
 def future_value(financial_instrument, time_period):
-    if isinstance(financial_instrument, Stock):
-        return financial_instrument.current_price * (1 + 0.05) ** time_period
-    elif isinstance(financial_instrument, Bond):
-        return financial_instrument.face_value * (1 + financial_instrument.coupon_rate) ** time_period
-    elif isinstance(financial_instrument, Option):
-        return 0  # Placeholder, as options require more complex pricing models
+    return _dispatch(_FV_DISPATCH, financial_instrument)(financial_instrument, time_period)
+
+# Function to calculate the future value of a financial instrument for every period in years
+def future_value_grid(financial_instrument, years):
+    fv_grid = _dispatch(_FV_GRID_DISPATCH, financial_instrument)
+    return fv_grid(financial_instrument, np.asarray(years))
+
+# Function to calculate the future value of many bonds at once
+def future_value_bonds(face_value, coupon_rate, time_period):
+    face = np.asarray(face_value, dtype=np.float64)
+    coupon = np.asarray(coupon_rate, dtype=np.float64)
+    # The kernel takes one period for all bonds; per-bond periods broadcast in NumPy
+    if not NUMBA_AVAILABLE or np.ndim(time_period):
+        return face * (1.0 + coupon) ** np.asarray(time_period)
+    face, coupon = np.broadcast_arrays(face, coupon)
+    out = np.empty(face.shape)
+    _fv_bonds(face.ravel(), coupon.ravel(), time_period, out.reshape(-1))
+    return out[()] if out.ndim == 0 else out
+
+# Groups smaller than this are cheaper to value one instrument at a time
+_BULK_PV_MIN_GROUP = 64
 
 # Function to simulate a portfolio with multiple financial instruments
+# A Portfolio is valued with one vectorized reduction per instrument kind. Other
+# iterables are grouped by type when they are large enough for that to pay off;
+# build a Portfolio to value the same instruments repeatedly
 def simulate_portfolio(portfolio):
-    return sum(present_value(inst) for inst in portfolio)
+    if isinstance(portfolio, Portfolio):
+        columns = portfolio.to_numpy()
+        pv_stocks = columns['stock_prices'].sum()
+        pv_bonds = (columns['bond_face'] / (1.0 + columns['bond_coupon'])).sum()
+        return float(pv_stocks + pv_bonds)
+    instruments = portfolio if isinstance(portfolio, (list, tuple)) else list(portfolio)
+    if len(instruments) < _BULK_PV_MIN_GROUP:
+        return sum(present_value(inst) for inst in instruments)
+    buckets = defaultdict(list)
+    for inst in instruments:
+        buckets[type(inst)].append(inst)
+    total = 0
+    for group in buckets.values():
+        if len(group) < _BULK_PV_MIN_GROUP:
+            total += sum(present_value(inst) for inst in group)
+        else:
+            total += _dispatch(_BULK_PV_DISPATCH, group[0])(group)
+    return total
+
+# Discount factors 1 / (1 + r) ** i for every rate and period, built as a running product
+def _discount_factors(rates, periods, out=None):
+    df = np.empty((rates.size, periods)) if out is None else out
+    df[:, :1] = 1.0
+    df[:, 1:] = (1.0 / (1.0 + rates))[:, None]
+    np.cumprod(df, axis=1, out=df)
+    return df
+
+# The term-by-term NPV divides by 1 + r from the second period on, so a rate of -100%
+# raises ZeroDivisionError there; checked before any kernel runs so every backend agrees
+def _check_discount_rates(rates, periods):
+    if periods > 1 and (rates == -1.0).any():
+        raise ZeroDivisionError("float division by zero")
+
+# NPV evaluated term by term in Python, exact for Decimal and other non-float numbers
+def _npv_decimal(cash_flow, discount_rate):
+    return sum(cash / (1 + discount_rate) ** i for i, cash in enumerate(cash_flow))
 
 # Function to calculate the net present value (NPV) of a cash flow
+# The NPV is a polynomial in 1 / (1 + r), so numeric cash flows are evaluated as float64
+# with Horner's scheme; anything NumPy would store as objects keeps the exact Python path
 def calculate_npv(cash_flow, discount_rate):
-    return sum(cash / (1 + discount_rate) ** i for i, cash in enumerate(cash_flow))
+    cf = np.asarray(cash_flow)
+    if cf.dtype.kind not in 'biuf' or not isinstance(discount_rate, _FLOAT_TYPES):
+        return _npv_decimal(cash_flow, discount_rate)
+    cf = np.ascontiguousarray(cf, dtype=np.float64)
+    _check_discount_rates(np.float64(discount_rate), cf.size)
+    if cf.size <= 1:
+        return float(cf.sum())  # Nothing is discounted, whatever the rate
+    if _NPV_COMPILED:
+        return _npv_scalar(cf, float(discount_rate))
+    # Without a compiled kernel, a dot product with the discount factors keeps the
+    # multiply-adds in BLAS instead of an interpreted loop
+    return float(cf @ _discount_factors(np.array([float(discount_rate)]), cf.size)[0])
+
+# Function to build an NPV function specialized for cash flows of a fixed number of periods
+# Each length is compiled on first use, so this pays off when many cash flows share a tenor
+def specialized_npv(periods):
+    kernel = _make_npv(periods)
+
+    def npv(cash_flow, discount_rate):
+        cf = np.ascontiguousarray(cash_flow, dtype=np.float64)
+        if cf.size != periods:
+            raise ValueError(f"Expected a cash flow of {periods} periods, got {cf.size}")
+        _check_discount_rates(np.float64(discount_rate), periods)
+        if periods <= 1:
+            return float(cf.sum())  # Nothing is discounted, whatever the rate
+        return float(kernel(cf, float(discount_rate)))
+
+    return npv
+
+# Record layout of a sensitivity analysis result
+_SENSITIVITY_DTYPE = np.dtype([('rate', np.float64), ('npv', np.float64)])
+
+# Discount rates as a float64 array; iterators that are not sequences are read with fromiter
+def _as_rates(discount_rate_range):
+    if isinstance(discount_rate_range, (Sequence, np.ndarray)):
+        return np.asarray(discount_rate_range, dtype=np.float64)
+    return np.fromiter(discount_rate_range, dtype=np.float64)
+
+# Reusable buffers for repeated sensitivity analyses of equally sized inputs
+# The discount-factor workspace is only needed without a compiled kernel
+class NPVContext:
+    __slots__ = ('cf', 'df', 'out')
+
+    def __init__(self, cf_size, n_rates):
+        self.cf = np.empty(cf_size)
+        self.df = None if _NPV_COMPILED else np.empty((n_rates, cf_size))
+        self.out = np.empty(n_rates, dtype=_SENSITIVITY_DTYPE)
 
 # Function to perform sensitivity analysis on NPV
-def sensitivity_analysis(cash_flow, discount_rate_range):
-    return {rate: calculate_npv(cash_flow, rate) for rate in discount_rate_range}
+# Returns a record array with one (rate, npv) row per discount rate.
+# With a ctx the result is written into ctx.out and overwritten by the next call.
+# The rates are independent, so large grids are evaluated in parallel; without
+# a compiled kernel all NPVs come from one matrix-vector product instead
+def sensitivity_analysis(cash_flow, discount_rate_range, ctx=None):
+    if ctx is None:
+        cf = np.ascontiguousarray(cash_flow, dtype=np.float64)
+        rates = _as_rates(discount_rate_range)
+        result = np.empty(rates.size, dtype=_SENSITIVITY_DTYPE)
+        df = None
+    else:
+        cf, result, df = ctx.cf, ctx.out, ctx.df
+        rates = _as_rates(discount_rate_range)
+        if len(cash_flow) != cf.size or rates.size != result.size:
+            raise ValueError("cash_flow and discount_rate_range must match the NPVContext sizes")
+        cf[...] = cash_flow
+    # Fields are taken once through a plain structured array; recarray attribute access is slow
+    rate, npv = result['rate'], result['npv']
+    rate[...] = rates
+    _check_discount_rates(rate, cf.size)
+    if cf.size <= 1:
+        npv[...] = cf.sum()  # Nothing is discounted, whatever the rate
+    elif NUMBA_AVAILABLE and rate.size * cf.size >= _PARALLEL_MIN_WORK:
+        _npv_matrix(cf, rate, npv)
+    elif _NPV_COMPILED:
+        _npv_rates(cf, rate, npv)
+    else:
+        np.matmul(_discount_factors(rate, cf.size, out=df), cf, out=npv)
+    return result.view(np.recarray)
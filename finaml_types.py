@@ -1,24 +1,138 @@
 # finaml_types.py
+from array import array
+
+import numpy as np
+
+__all__ = ['FinancialInstrument', 'Stock', 'Bond', 'Option', 'Portfolio']
+
+# Public slot names of each instrument type, collected once per type
+_SLOT_FIELDS = {}
+
+def _slot_fields(cls):
+    try:
+        return _SLOT_FIELDS[cls]
+    except KeyError:
+        pass
+    fields = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        fields += [name for name in slots if not name.startswith('_')]
+    _SLOT_FIELDS[cls] = fields = tuple(fields)
+    return fields
 
 # Define a financial instrument using Algebraic Data Types
 class FinancialInstrument:
+    __slots__ = ('_str',)
+
+    # Field names and values: the slots declared anywhere in the class hierarchy,
+    # then the ordinary attributes of subclasses that do not declare __slots__
+    def _fields(self):
+        fields = []
+        for key in _slot_fields(type(self)):
+            try:
+                fields.append((key, getattr(self, key)))
+            except AttributeError:
+                pass
+        fields += getattr(self, '__dict__', {}).items()
+        return fields
+
+    # The string form is built on first use and cached in _str together with the
+    # field objects it was built from (kept alive so their ids stay unique); it is
+    # rebuilt once any field is rebound. Identity checks work for any value type
     def __str__(self):
-        return f"{self.__class__.__name__}({', '.join([f'{key}={value}' for key, value in self.__dict__.items()])})"
+        fields = self._fields()
+        key = [(name, id(value)) for name, value in fields]
+        try:
+            cached_key, _, text = self._str
+            if cached_key == key:
+                return text
+        except AttributeError:
+            pass
+        text = f"{self.__class__.__name__}({', '.join([f'{name}={value}' for name, value in fields])})"
+        self._str = (key, fields, text)
+        return text
 
 class Stock(FinancialInstrument):
+    __slots__ = ('ticker_symbol', 'current_price')
+
     def __init__(self, ticker_symbol, current_price):
         self.ticker_symbol = ticker_symbol
         self.current_price = current_price
 
 class Bond(FinancialInstrument):
+    __slots__ = ('ticker_symbol', 'face_value', 'coupon_rate')
+
     def __init__(self, ticker_symbol, face_value, coupon_rate):
         self.ticker_symbol = ticker_symbol
         self.face_value = face_value
         self.coupon_rate = coupon_rate
 
 class Option(FinancialInstrument):
+    __slots__ = ('option_type', 'underlying_asset', 'strike_price', 'expiration_date')
+
     def __init__(self, option_type, underlying_asset, strike_price, expiration_date):
         self.option_type = option_type
         self.underlying_asset = underlying_asset
         self.strike_price = strike_price
         self.expiration_date = expiration_date
+
+# Define a portfolio that stores each kind of instrument column-wise
+# Columns are private and only exposed as read-only arrays, so the cached
+# arrays cannot go stale behind the add methods' back
+class Portfolio:
+    _COLUMNS = ('stock_prices', 'bond_face', 'bond_coupon')
+    __slots__ = ('_stock_prices', '_bond_face', '_bond_coupon', '_arrays')
+
+    def __init__(self, instruments=()):
+        self._arrays = None
+        self._stock_prices = array('d')
+        self._bond_face = array('d')
+        self._bond_coupon = array('d')
+        for instrument in instruments:
+            self.add(instrument)
+
+    def add_stock(self, stock):
+        self._arrays = None
+        self._stock_prices.append(stock.current_price)
+
+    def add_bond(self, bond):
+        self._arrays = None
+        self._bond_face.append(bond.face_value)
+        self._bond_coupon.append(bond.coupon_rate)
+
+    def add_option(self, option):
+        pass  # Options are not priced yet, so there is nothing to store
+
+    def add(self, instrument):
+        try:
+            add = _PORTFOLIO_ADD[type(instrument)]
+        except KeyError:
+            raise TypeError(f"Unsupported financial instrument: {type(instrument).__name__}") from None
+        add(self, instrument)
+
+    # Copy every column into a read-only float64 NumPy array
+    # The copies are cached until the next add, so repeated valuations do not copy again
+    def to_numpy(self):
+        if self._arrays is None:
+            arrays = {}
+            for name in self._COLUMNS:
+                arrays[name] = np.array(getattr(self, '_' + name), dtype=np.float64)
+                arrays[name].flags.writeable = False
+            self._arrays = arrays
+        return dict(self._arrays)
+
+    @property
+    def stock_prices(self):
+        return self.to_numpy()['stock_prices']
+
+    @property
+    def bond_face(self):
+        return self.to_numpy()['bond_face']
+
+    @property
+    def bond_coupon(self):
+        return self.to_numpy()['bond_coupon']
+
+_PORTFOLIO_ADD = {Stock: Portfolio.add_stock, Bond: Portfolio.add_bond, Option: Portfolio.add_option}